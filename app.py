@@ -6,6 +6,7 @@ Streamlit: 古代ケルト十字法タロット占い（A.E.ウェイト『タ
 - 入力は Streamlit の form を使用（Enter 送信可）
 - 象徴カード（シグニフィケーター）には逆位置はないものとする
 - 逆位置は CSS transform: rotate で表現
+- カード画像は Streamlit の静的ファイル配信（static/cards/、.streamlit/config.toml で有効化）で送る
 - 自分自身に関する質問は、象徴カードをコート（宮廷）カードから、TF-IDF類似度で選定
 - 自分自身に関することでない質問は、象徴カードを全カードから、TF-IDF類似度で選定
 - 各カードの解釈／まとめ／アドバイスを LLM でストリーム生成
@@ -14,23 +15,33 @@ Streamlit: 古代ケルト十字法タロット占い（A.E.ウェイト『タ
 from __future__ import annotations
 
 import argparse
-import base64
+import functools
 import json
 import os
+import queue
 import random
+import re
 import subprocess
 import sys
-from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union, TypedDict
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union, TypedDict
 import requests
 
+import numpy as np
 import streamlit as st
-from sklearn.feature_extraction.text import TfidfVectorizer
 
-from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, BaseMessage
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import Runnable, RunnableConfig
-from langchain_openai import ChatOpenAI
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+if TYPE_CHECKING:
+    # langchain_openai（openai SDK ごと）は重いので、実行時は build_llm() の中で読み込む
+    from langchain_core.runnables import Runnable
+    from langchain_openai import ChatOpenAI
+
+try:
+    import orjson  # 任意。あれば JSON の読み込みに使う
+except ImportError:
+    orjson = None  # type: ignore[assignment]
 
 
 # ========================= 型定義 =========================
@@ -59,6 +70,13 @@ class DealtCard(TypedDict):
     reversed: str
 
 
+# symbol 文の TF-IDF 索引: (語彙 → 列番号, IDF, 行を L2 正規化した TF-IDF 行列)
+SymbolIndex = Tuple[Dict[str, int], np.ndarray, np.ndarray]
+
+# 象徴カードの候補集合: (候補カード, 語彙, IDF, TF-IDF 行列)
+CandidateBucket = Tuple[List[Card], Dict[str, int], np.ndarray, np.ndarray]
+
+
 # ========================= ページ設定 =========================
 
 st.set_page_config(
@@ -70,11 +88,13 @@ st.set_page_config(
 
 # ========================= LLM 設定ユーティリティ =========================
 
+@functools.lru_cache(maxsize=1)
 def is_macos() -> bool:
     """実行環境が macOS かどうかを判定する。"""
     return sys.platform == "darwin"
 
 
+@functools.lru_cache(maxsize=1)
 def is_wsl() -> bool:
     """WSL 環境かどうかを判定する（/proc/version を簡易チェック）。"""
     try:
@@ -85,22 +105,24 @@ def is_wsl() -> bool:
         return False
 
 
+@functools.lru_cache(maxsize=1)
 def get_windows_host_ip() -> str:
     """
     WSL→Windows のホスト IP を推定する。
-    1) ルートテーブルのデフォルトゲートウェイ
+    1) ルートテーブルのデフォルトゲートウェイ（WSL のときのみ）
     2) /etc/resolv.conf の nameserver
     見つからなければ 127.0.0.1
     """
-    try:
-        out = subprocess.check_output(
-            ["sh", "-lc", "ip route show default | awk '{print $3}'"],
-            stderr=subprocess.DEVNULL,
-        ).decode().strip()
-        if out:
-            return out.split()[0]
-    except Exception:
-        pass
+    if is_wsl():
+        try:
+            out = subprocess.check_output(
+                ["sh", "-lc", "ip route show default | awk '{print $3}'"],
+                stderr=subprocess.DEVNULL,
+            ).decode().strip()
+            if out:
+                return out.split()[0]
+        except Exception:
+            pass
     try:
         with open("/etc/resolv.conf", "r", encoding="utf-8", errors="ignore") as f:
             for line in f:
@@ -113,6 +135,7 @@ def get_windows_host_ip() -> str:
     return "127.0.0.1"
 
 
+@functools.lru_cache(maxsize=1)
 def detect_platform() -> str:
     """
     実行プラットフォームのデフォルト値を決める。
@@ -185,7 +208,6 @@ def resolve_llm_config() -> Tuple[str, str, str, float, str, str]:
     backend_default = "lmstudio"
     model_default = "gemma-3-4b-it-qat"
     api_key_default = "api_key"
-    base_url_default = default_base_url(platform_default, backend_default)
 
     # 2. 環境変数で上書き
     platform_env = os.getenv("LLM_PLATFORM", platform_default)
@@ -281,9 +303,21 @@ SYSTEM_PROMPT: str = (
     "すべて日本語で回答してください。"
 )
 
+# 各プロンプトで共有するシステム・メッセージ（不変なので 1 度だけ作る）
+SYSTEM_MESSAGE: SystemMessage = SystemMessage(content=SYSTEM_PROMPT)
+
 
 # ========================= 外部ファイル読み込み =========================
 
+def read_json(path: str) -> Any:
+    """JSON ファイルを読み込む。orjson が使えればそちらで解析する。"""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
 @st.cache_data(show_spinner=False)
 def load_tarot_meta(path: str = "data/tarot_meta.json") -> Dict[str, Any]:
     """
@@ -296,8 +330,7 @@ def load_tarot_meta(path: str = "data/tarot_meta.json") -> Dict[str, Any]:
         メタ情報ディクショナリ（読み込めなかった時は空）
     """
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return read_json(path)
     except FileNotFoundError:
         st.error(f"{path} が見つかりません。")
         return {}
@@ -345,15 +378,14 @@ def _normalize_item(raw: Union[str, Dict[str, Any]]) -> Optional[Card]:
         return None
 
 
-@st.cache_data(show_spinner=False)
+@st.cache_resource(show_spinner=False)
 def load_tarot_cards(path: str = "data/tarot_cards.json") -> List[Card]:
     """
     カード定義のリストを JSON から読み込み、index 昇順で返す。
     不正な要素はスキップし、件数を警告表示する。
     """
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = read_json(path)
     except FileNotFoundError:
         st.error(f"{path} が見つかりません。")
         return []
@@ -380,21 +412,43 @@ def load_tarot_cards(path: str = "data/tarot_cards.json") -> List[Card]:
     return normalized
 
 
-@st.cache_data(show_spinner=False)
-def img_to_base64(path: str) -> str:
+# 透明1px PNG
+TRANSPARENT_PNG_URI: str = (
+    "data:image/png;base64,"
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR4nGMAAQAABQABDQottgAAAABJRU5ErkJggg=="
+)
+
+
+cards_db: List[Card] = load_tarot_cards()
+
+
+@st.cache_resource(show_spinner=False)
+def load_card_image_urls() -> Dict[str, str]:
     """
-    画像ファイルを base64 文字列に変換する。
-    ファイルが無い場合は 1px 透明 PNG を返す。
+    img_id → カード画像の URL の辞書を返す。
+    画像は Streamlit の静的ファイル配信（static/cards/ → app/static/cards/）で送り、
+    ブラウザにキャッシュさせる。ファイルが無い場合は 1px 透明 PNG にする。
     """
-    try:
-        with open(path, "rb") as f:
-            return base64.b64encode(f.read()).decode("utf-8")
-    except FileNotFoundError:
-        # 透明1px PNG
-        return "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR4nGMAAQAABQABDQottgAAAABJRU5ErkJggg=="
+    urls: Dict[str, str] = {}
+    for c in cards_db:
+        name = f"cards/{c['img_id']}.png"
+        urls[c["img_id"]] = f"app/static/{name}" if os.path.exists(f"static/{name}") else TRANSPARENT_PNG_URI
+    return urls
 
 
-cards_db: List[Card] = load_tarot_cards()
+CARD_IMG_URL: Dict[str, str] = load_card_image_urls()
+
+# cards_db 上の位置（山札の添字）
+ALL_CARD_INDICES: range = range(len(cards_db))
+
+
+@st.cache_resource(show_spinner=False)
+def load_card_positions() -> Dict[str, int]:
+    """img_id → cards_db 上の位置 の索引。"""
+    return {c["img_id"]: i for i, c in enumerate(cards_db)}
+
+
+CARD_POS_BY_IMG_ID: Dict[str, int] = load_card_positions()
 
 
 # ========================= ヘッダー =========================
@@ -407,8 +461,10 @@ st.image("images/pkt-gai.jpg", width="stretch")
 
 # ========================= 入力（フォーム） =========================
 
+SEX_OPTIONS: List[str] = ["男", "女", "その他"]
+
 with st.form("reading_form", clear_on_submit=False):
-    sex: str = st.selectbox("性別を選択してください。", ["男", "女", "その他"])
+    sex: str = st.selectbox("性別を選択してください。", SEX_OPTIONS)
     age_category: str = st.radio("年齢を選択してください。", ["40歳未満", "40歳以上"])
     over_40: bool = (age_category == "40歳以上")
     is_self: bool = (st.radio("占いたいのは質問者自身のことですか？", ["はい", "いいえ"]) == "はい")
@@ -438,63 +494,263 @@ def reset_all() -> None:
 
 # ========================= LLM ユーティリティ =========================
 
+# `<<<CARD 3>>>` のような区切り記号として許す最大長
+SECTION_MARKER_MAX_LEN: int = 32
+
+# ストリーム描画で、改行が来なくても再描画する文字数の間隔
+STREAM_FLUSH_CHARS: int = 40
+
+# 質問文の英訳で生成するトークン数の上限
+TRANSLATE_MAX_TOKENS: int = 256
+
+# 1 回の呼び出しでまとめてリーディングするカードの枚数。
+# プロンプトと出力の合計が、LM Studio / Ollama 既定のコンテキスト長（4096 トークン）に収まるようにする
+READING_BATCH_SIZE: int = 3
+
+# リーディングで生成するトークン数の上限（一括リーディングはカード 1 枚あたり）
+READING_MAX_TOKENS_PER_CARD: int = 400
+RECURRENCE_MAX_TOKENS: int = 400
+# まとめとアドバイスは 1 回の呼び出しで両方を生成するので、それぞれ 600 の 2 つ分
+CONCLUSION_MAX_TOKENS: int = 1200
+
+
+@st.cache_resource(show_spinner=False)
+def get_executor() -> ThreadPoolExecutor:
+    """
+    LLM ストリームを並行して消費するためのスレッドプール（プロセス内で共有）。
+    1 回の占いで最大 6 本のストリームを使うので、複数人が同時に占っても足りるよう HTTP の接続数に合わせる。
+    """
+    return ThreadPoolExecutor(max_workers=32, thread_name_prefix="llm-stream")
+
+
+@st.cache_resource(show_spinner=False)
+def get_translate_executor() -> ThreadPoolExecutor:
+    """
+    質問文の英訳用のスレッドプール（プロセス内で共有）。
+    短い英訳が、他の利用者の長いリーディングのストリームの後ろで待たされないよう分けておく。
+    """
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="llm-translate")
+
+
+@st.cache_resource(show_spinner=False)
 def build_llm() -> ChatOpenAI:
     """
-    LangChain の ChatOpenAI を構築する。
+    LangChain の ChatOpenAI を構築する（プロセス内で 1 つを共有）。
+    HTTP クライアントも共有し、LLM サーバーへの接続をキープアライブで使い回す。
     """
+    import httpx
+    from langchain_openai import ChatOpenAI
+
+    http_client = httpx.Client(
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+    )
     return ChatOpenAI(
         model=MODEL,
         base_url=BASE_URL,
         temperature=TEMPERATURE,
         api_key=LLM_API_KEY,
+        http_client=http_client,
     )
 
 
+def max_tokens_kwargs(limit: int) -> Dict[str, Any]:
+    """
+    生成トークン数の上限を指定する bind 用の引数。
+    langchain-openai は max_tokens を max_completion_tokens に読み替えて送るが、
+    LM Studio / Ollama の OpenAI 互換 API はそれを読まないので、max_tokens のまま本文に載せる。
+    """
+    return {"extra_body": {"max_tokens": limit}}
+
+
+@st.cache_resource(show_spinner=False)
+def build_translate_llm() -> Runnable:
+    """
+    質問文の英訳用 LLM。接続は build_llm() と共有し、
+    訳を決定的にするため temperature=0、出力も短く制限する。
+    """
+    return build_llm().bind(temperature=0, **max_tokens_kwargs(TRANSLATE_MAX_TOKENS))
+
+
 def stream_chat(
-    chat: ChatOpenAI,
+    chat: Runnable,
     messages: List[Union[HumanMessage, AIMessage, SystemMessage]],
 ) -> Iterator[str]:
     """
-    ChatOpenAI.stream による逐次出力をジェネレータで返す。
+    ChatOpenAI（または bind 済みの Runnable）の stream による逐次出力をジェネレータで返す。
     """
-    for chunk in chat.stream(messages):
-        if getattr(chunk, "content", None):
-            yield chunk.content
+    chunks = chat.stream(messages)
+    try:
+        for chunk in chunks:
+            if getattr(chunk, "content", None):
+                yield chunk.content
+    finally:
+        # 途中で打ち切られたときも HTTP のレスポンスを閉じ、LLM サーバー側の生成を止める
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
 
 
-def write_stream(text_iter: Iterable[str]) -> str:
+def split_sections(text_iter: Iterable[str], first_key: Optional[str] = None) -> Iterator[Tuple[str, str]]:
     """
-    Streamlit に対して、ストリーム表示が可能なら st.write_stream、
-    そうでなければ逐次描画する。
+    `<<<名前>>>` の区切り記号で分けられたストリームを (セクション名, 断片) の列に分解する。
+    小型モデルは `<<CARD 1>>` や `<<<<CARD 1>>>>` のように括弧の数を誤ることがあるので、
+    2 個以上の "<" と ">" で囲まれた短い 1 行を区切り記号とみなす（名前の前後の "<" ">" は除く）。
+    チャンク境界で区切り記号が分断されても取りこぼさないよう、"<<" 以降は閉じ括弧が届くまで保留する。
+    最初の区切り記号より前の出力は first_key のセクションとして返す（None なら捨てる）。
     """
-    if hasattr(st, "write_stream"):
-        return st.write_stream(text_iter)  # type: ignore[call-arg]
-    ph = st.empty()
+    key: Optional[str] = first_key
     buf = ""
+
+    def drain(final: bool) -> Iterator[Tuple[str, str]]:
+        nonlocal key, buf
+        while True:
+            start = buf.find("<<")
+            if start < 0:
+                # 末尾の "<" は区切り記号の書き出しかもしれないので保留
+                keep = 0 if final or not buf.endswith("<") else 1
+                out, buf = buf[:len(buf) - keep], buf[len(buf) - keep:]
+                if out and key is not None:
+                    yield key, out
+                return
+            end = buf.find(">>", start + 2)
+            span = buf[start:end if end >= 0 else len(buf)]
+            if len(span) > SECTION_MARKER_MAX_LEN or "\n" in span or (end < 0 and final):
+                # 長すぎるもの・改行をまたぐもの・閉じないものは区切り記号ではないとみなす
+                if key is not None:
+                    yield key, buf[:start + 2]
+                buf = buf[start + 2:]
+                continue
+            if start and key is not None:
+                yield key, buf[:start]
+            buf = buf[start:]
+            if end < 0:
+                return
+            close = end - start + 2
+            while close < len(buf) and buf[close] == ">":
+                close += 1
+            if close == len(buf) and not final:
+                # 閉じ括弧の続き（">>>" の 3 個目など）が次のチャンクで届くかもしれない
+                return
+            key = buf[:close].strip("<> \t")
+            buf = buf[close:]
+
     for piece in text_iter:
         buf += piece
-        ph.markdown(buf)
-    return buf
+        yield from drain(final=False)
+    yield from drain(final=True)
+
+
+def write_sections(sections: Iterable[Tuple[Any, str]], placeholders: Dict[Any, Any]) -> Dict[Any, str]:
+    """
+    (キー, 断片) の列を、キーごとに用意した st.empty() のプレースホルダへ逐次描画する。
+    断片ごとに全文を描き直すと O(N²) になるので、改行を含むときか
+    STREAM_FLUSH_CHARS 文字たまったときだけ再描画し、最後にまとめて反映する。
+    対応するプレースホルダの無いキーは無視する。
+
+    Returns:
+        キーごとの全文
+    """
+    texts: Dict[Any, str] = {}
+    flushed: Dict[Any, int] = {}
+    for key, piece in sections:
+        ph = placeholders.get(key)
+        if ph is None:
+            continue
+        text = texts.get(key, "") + piece
+        texts[key] = text
+        if "\n" in piece or len(text) - flushed.get(key, 0) >= STREAM_FLUSH_CHARS:
+            ph.markdown(text)
+            flushed[key] = len(text)
+
+    for key, text in texts.items():
+        if flushed.get(key) != len(text):
+            placeholders[key].markdown(text)
+    return texts
+
+
+def merge_streams(streams: List[Iterable[Tuple[Any, str]]]) -> Iterator[Tuple[Any, str]]:
+    """
+    互いに独立した複数の (キー, 断片) ストリームを別スレッドで同時に消費し、
+    届いた順に 1 本の列にまとめる（LLM 側のプリフィル・生成を重ね合わせる）。
+    Streamlit への描画は、呼び出し元であるスクリプトのスレッドで行うこと。
+    受け取り側が途中でいなくなったとき（エラー、再実行、ページの再読み込み）は、
+    各スレッドもストリームを閉じて止まり、スレッドと LLM サーバーの枠を解放する。
+    """
+    q: "queue.Queue[Any]" = queue.Queue()
+    done = object()
+    stop = threading.Event()
+
+    def pump(stream: Iterable[Tuple[Any, str]]) -> None:
+        try:
+            for item in stream:
+                if stop.is_set():
+                    break
+                q.put(item)
+        except Exception as e:
+            q.put(e)
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+            q.put(done)
+
+    executor = get_executor()
+    for stream in streams:
+        executor.submit(pump, stream)
+
+    remaining = len(streams)
+    try:
+        while remaining:
+            item = q.get()
+            if item is done:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        stop.set()
+
+
+def tag_stream(key: Any, text_iter: Iterable[str]) -> Iterator[Tuple[Any, str]]:
+    """文字列ストリームの各断片にキーを付ける（merge_streams 用）。"""
+    for piece in text_iter:
+        yield key, piece
 
 
 # ========================= ロジック =========================
 
-def translate_query(query: str, chat: ChatOpenAI) -> str:
+@st.cache_data(show_spinner=False, max_entries=256, ttl=3600)
+def translate_query(query: str, _chat: Runnable) -> str:
     """
     日本語の質問を英訳する（英文との類似度計算のため）。
+    空、または ASCII のみ（英語で入力済み）の場合は LLM を呼ばない。
+    訳は決定的なので、同じ質問文の結果はキャッシュする（_chat はキーに含めない）。
+    質問文は利用者の個人的な内容なので、キャッシュは件数と保持時間（1 時間）を制限する。
     """
     if not query.strip():
         return ""
+    if query.isascii():
+        return query.strip()
     prompt = "次の日本語を英語に訳してください。訳した文章だけを返してください：\n\n" + query
-    resp: AIMessage = chat.invoke([HumanMessage(content=prompt)])  # type: ignore[assignment]
+    resp: AIMessage = _chat.invoke([HumanMessage(content=prompt)])  # type: ignore[assignment]
     return resp.content.strip()
 
 
+COURT_RANKS: Tuple[str, ...] = ("King", "Queen", "Knight", "Page")
+
+
 def is_court_of_rank(card_name: str, rank: str) -> bool:
     """カード英名がコートカードかどうか。"""
     return card_name.startswith(f"{rank} of ")
 
 
+@st.cache_resource(show_spinner=False)
+def load_court_cards() -> Dict[str, List[Card]]:
+    """コートカードをランクごとにまとめる（例: "King" → King of Wands, ...）。"""
+    return {r: [c for c in cards_db if is_court_of_rank(c.get("name", ""), r)] for r in COURT_RANKS}
+
+
 def get_candidate_cards(self_flag: bool, sex: str, over_40: bool) -> List[Card]:
     """
     象徴カードの候補を返す。
@@ -510,36 +766,126 @@ def get_candidate_cards(self_flag: bool, sex: str, over_40: bool) -> List[Card]:
     else:
         targets = ["Knight", "Queen"] if over_40 else ["King", "Page"]
 
-    courts = [c for c in cards_db if any(is_court_of_rank(c.get("name", ""), r) for r in targets)]
+    courts_by_rank = load_court_cards()
+    courts = [c for r in targets for c in courts_by_rank[r]]
     if not courts:
-        all_courts = ["King", "Queen", "Knight", "Page"]
-        courts = [c for c in cards_db if any(is_court_of_rank(c.get("name", ""), r) for r in all_courts)]
+        courts = [c for r in COURT_RANKS for c in courts_by_rank[r]]
     return courts or cards_db
 
 
-def choose_card(candidates: List[Card], query_en: str) -> Card:
+# scikit-learn の TfidfVectorizer 既定と同じ分かち書き（2 文字以上の単語）
+TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
+
+
+def tokenize(text: str) -> List[str]:
+    """英文を小文字化して単語に分割する。"""
+    return TOKEN_RE.findall(text.lower())
+
+
+def term_counts(text: str, vocab: Dict[str, int]) -> np.ndarray:
+    """語彙に含まれる単語の出現回数ベクトル（語彙外の単語は無視）。"""
+    counts = np.zeros(len(vocab), dtype=np.float32)
+    for tok in tokenize(text):
+        j = vocab.get(tok)
+        if j is not None:
+            counts[j] += 1
+    return counts
+
+
+@st.cache_resource(show_spinner=False)
+def build_symbol_index() -> SymbolIndex:
+    """
+    全カードの symbol から TF-IDF 行列（行は cards_db の並び）を作り、語彙・IDF と共に返す。
+    重み付けは scikit-learn の TfidfVectorizer 既定（smooth_idf, L2 正規化）と同じ。
+    カードの symbol は不変なので、プロセスごとに 1 度だけ構築する。
+    """
+    docs = [tokenize(c.get("symbol", "")) for c in cards_db]
+
+    vocab: Dict[str, int] = {}
+    for toks in docs:
+        for tok in toks:
+            vocab.setdefault(tok, len(vocab))
+
+    tf = np.zeros((len(docs), len(vocab)), dtype=np.float32)      # (N, d)
+    for i, toks in enumerate(docs):
+        for tok in toks:
+            tf[i, vocab[tok]] += 1
+
+    df = np.count_nonzero(tf, axis=0)
+    idf = (np.log((1 + len(docs)) / (1 + df)) + 1).astype(np.float32)
+    M = tf * idf
+    norms = np.linalg.norm(M, axis=1, keepdims=True)
+    M /= np.where(norms == 0, 1, norms)
+    return vocab, idf, M
+
+
+@st.cache_resource(show_spinner=False)
+def build_candidate_buckets() -> Dict[Tuple[bool, str, bool], CandidateBucket]:
+    """
+    (自分自身の質問か, 性別, 40歳以上か) の全組合せについて、
+    象徴カードの候補と、全カードの TF-IDF 行列から候補の行だけを切り出したものを用意する。
+    """
+    vocab, idf, M_all = build_symbol_index()
+    buckets: Dict[Tuple[bool, str, bool], CandidateBucket] = {}
+    for self_flag in (True, False):
+        for sex in SEX_OPTIONS:
+            for over_40 in (True, False):
+                candidates = get_candidate_cards(self_flag, sex, over_40)
+                if not candidates:
+                    continue
+                rows = [CARD_POS_BY_IMG_ID[c["img_id"]] for c in candidates]
+                buckets[(self_flag, sex, over_40)] = (candidates, vocab, idf, M_all[rows])
+    return buckets
+
+
+CANDIDATE_BUCKETS: Dict[Tuple[bool, str, bool], CandidateBucket] = build_candidate_buckets()
+
+
+def get_rng() -> random.Random:
+    """
+    セッションごとの乱数生成器を返す。
+    環境変数 TAROT_SEED が整数なら、それをシードにして結果を再現できるようにする。
+    """
+    if "rng" not in st.session_state:
+        try:
+            seed: Optional[int] = int(os.environ["TAROT_SEED"])
+        except (KeyError, ValueError):
+            seed = None
+        st.session_state.rng = random.Random(seed)
+    return st.session_state.rng
+
+
+def choose_card(bucket: CandidateBucket, query_en: str, rng: random.Random) -> Card:
+    """
+    英訳した質問と symbol の TF-IDF 類似度が最も高いカードを候補から選ぶ。
+    """
+    candidates, vocab, idf, M = bucket
     if not candidates:
         return {}  # type: ignore[return-value]
     if not query_en.strip():
-        return random.choice(candidates)
+        return rng.choice(candidates)
+    if len(candidates) == 1:
+        return candidates[0]
 
-    corpus = [c.get("symbol", "") for c in candidates] + [query_en]
-    vec = TfidfVectorizer().fit(corpus)
-    M = vec.transform([c.get("symbol", "") for c in candidates])  # (N, d)
-    q = vec.transform([query_en])                                  # (1, d)
-    sims = (M @ q.T).toarray().ravel()                             # 形状(N,)
+    # argmax は q の大きさに依らないので、q の正規化は不要
+    q = term_counts(query_en, vocab) * idf                         # (d,)
+    sims = M @ q                                                   # 形状(N,)
     best_idx = int(sims.argmax())
     return candidates[best_idx]
 
 
-def generate_spread(sig_img_id: str) -> List[Dict[str, Union[Card, str, int]]]:
+def generate_spread(sig_img_id: str, rng: random.Random) -> List[Dict[str, Union[Card, str, int]]]:
     """
     象徴カード以外から 10 枚をランダムに選択し、正位置と逆位置をランダムに決める。
     """
-    pool = [c for c in cards_db if c["img_id"] != sig_img_id]
-    chosen = random.sample(pool, 10)
+    # 11 枚引いて象徴カードが混じっていれば除き、先頭の 10 枚を使う（除外用のリストを作らない）
+    sig_idx = CARD_POS_BY_IMG_ID.get(sig_img_id, -1)
+    chosen_idx = [i for i in rng.sample(ALL_CARD_INDICES, 11) if i != sig_idx][:10]
+    chosen = [cards_db[i] for i in chosen_idx]
+    # 10 枚分の向きを 1 回の乱数で決める（i 枚目は i-1 ビット目）
+    bits = rng.getrandbits(len(chosen))
     return [
-        {"index": i, "card": c, "orientation": random.choice(["upright", "reversed"])}
+        {"index": i, "card": c, "orientation": "reversed" if (bits >> (i - 1)) & 1 else "upright"}
         for i, c in enumerate(chosen, start=1)
     ]
 
@@ -625,8 +971,17 @@ def build_recurrence_summary_ja(counts: Dict[str, Dict[str, int]]) -> str:
     return "\n".join(lines)
 
 
+def build_query_header(sig: DealtCard, query_text: str) -> str:
+    """
+    各プロンプトの先頭に置く共通部分（象徴カードと質問文）。
+    同時に送るプロンプトの先頭をバイト単位で揃え、LLM サーバー側のプレフィックスキャッシュを効かせる。
+    """
+    return f"significator = {sig.get('name', '')}\nquery_text = {query_text}\n\n"
+
+
 def recurrence_reading_stream(
     chat: ChatOpenAI,
+    sig: DealtCard,
     query_text: str,
     recurrences_en: str,
     summary_ja: str,
@@ -638,30 +993,35 @@ def recurrence_reading_stream(
         return iter(())
 
     prompt = (
-        "次の「同じ向き（正位置・逆位置）で同ランク（役や数）で複数枚出現」の情報を踏まえ、"
+        build_query_header(sig, query_text)
+        + "次の「同じ向き（正位置・逆位置）で同ランク（役や数）で複数枚出現」の情報を踏まえ、"
         "質問に即した短いリーディングを日本語で出してください。\n"
         "- まず全体的な含意を一段落で簡潔に示す\n"
         "- 次に「注意点」を1〜3個の箇条書きで\n"
         "- 最後に「活かし方（アクション）」を1〜3個の箇条書きで\n"
         "- 不要な見出しや前置きは避け、簡潔に\n\n"
-        "[質問文]\n"
-        f"{query_text}\n\n"
         "[出現サマリ（日本語）]\n"
         f"{summary_ja}\n\n"
         "[Recurrences（英語サマリ）]\n"
         f"{recurrences_en}\n"
     )
-    return stream_chat(chat, [SystemMessage(content=SYSTEM_PROMPT), HumanMessage(content=prompt)])
+    return stream_chat(
+        chat.bind(**max_tokens_kwargs(RECURRENCE_MAX_TOKENS)),
+        [SYSTEM_MESSAGE, HumanMessage(content=prompt)],
+    )
 
 
 # ========================= 表示（CSS／LLMストリーム） =========================
 
-def render_layout_css(layout: str) -> None:
-    """
-    古代ケルト十字法スプレッドの CSS を挿入。
-    象徴カードの視線の向きlooking（right/left）に応じて 5 枚目／6 枚目の左右を入替。
-    """
-    base_css = """
+# スプレッド上の 1 枚分の HTML（位置, 画像 URL, 位置, 回転）
+BOARD_CARD_TMPL: str = (
+    '<div class="card-position card-pos%d">'
+    '<img src="%s" alt="card%d" style="transform:%s;" /></div>'
+)
+
+
+# 古代ケルト十字法スプレッドの CSS（5 枚目／6 枚目以外の配置）
+_BASE_LAYOUT_CSS: str = """
 <style>
 .celtic-cross-container {
   position: relative; width: 704px; height: 556px;
@@ -682,109 +1042,153 @@ def render_layout_css(layout: str) -> None:
 .card-pos9 { top: 28%; left: 86%; }
 .card-pos10 { top: 4%; left: 86%; }
 """
-    css_right = ".card-pos6 { top: 41%; left: 61%; }\n.card-pos5 { top: 41%; left: 4%; }"
-    css_left = ".card-pos5 { top: 41%; left: 61%; }\n.card-pos6 { top: 41%; left: 4%; }"
-    st.markdown(base_css + (css_right if layout == "right" else css_left) + "\n</style>", unsafe_allow_html=True)
+LAYOUT_CSS_RIGHT: str = (
+    _BASE_LAYOUT_CSS + ".card-pos6 { top: 41%; left: 61%; }\n.card-pos5 { top: 41%; left: 4%; }\n</style>"
+)
+LAYOUT_CSS_LEFT: str = (
+    _BASE_LAYOUT_CSS + ".card-pos5 { top: 41%; left: 61%; }\n.card-pos6 { top: 41%; left: 4%; }\n</style>"
+)
 
 
-def reading_stream(
-    chat: ChatOpenAI,
-    sig: DealtCard,
-    query_text: str,
-    card: DealtCard,
-    pos_label: str
-) -> Iterator[str]:
+def render_layout_css(layout: str) -> None:
     """
-    個別カードのリーディングを LLM ストリームで生成する。
+    古代ケルト十字法スプレッドの CSS を挿入。
+    象徴カードの視線の向きlooking（right/left）に応じて 5 枚目／6 枚目の左右を入替。
+    """
+    st.markdown(LAYOUT_CSS_RIGHT if layout == "right" else LAYOUT_CSS_LEFT, unsafe_allow_html=True)
+
+
+def card_info_block(card: DealtCard, pos_label: str) -> str:
+    """
+    プロンプトに載せる 1 枚分のカード情報。
     象徴カード（index=0）のときは向きと意味を出さない。
     """
     is_significator = (card.get("index") == 0)
     selected_meaning = "" if is_significator else card.get(card.get("orientation", "upright"), "")
     orient_text = ORIENT_LABEL.get(card.get("orientation", "upright"), "正位置") if not is_significator else ""
-    sig_jp = sig.get("japanese_name", "")
-    sig_en = sig.get("name", "")
     card_jp = card.get("japanese_name", "")
     card_en = card.get("name", "")
     symbol_text = card.get("symbol", "")
 
-    prompt = (
-        "今回の質問: " + query_text + "\n\n"
-        "[現在リーディングしようとしているカードの情報]\n"
+    return (
         f"カード名: {card_jp}（{card_en}）\n"
         f"位置: {pos_label}\n"
         + (f"向き: {orient_text}\n" if orient_text else "")
         + "カードが象徴するもの:\n"
         + symbol_text + "\n"
         + (f"このカードの{orient_text}でのリーディングにおける意味:\n{selected_meaning}\n" if selected_meaning else "")
-        + f"\n今回のスプレッド全体に関する象徴カード(Significator): {sig_jp}({sig_en})\n\n"
-        "上記カードの意味と位置を踏まえ、質問内容に対するリーディングを簡潔に短く解説してください。\n"
-        "改行を適宜入れ、読みやすい文章にしてください。回答に表題は不要です。\n"
-        "回答はすべて日本語でお願いします。\n"
     )
-    return stream_chat(chat, [SystemMessage(content=SYSTEM_PROMPT), HumanMessage(content=prompt)])
 
 
-def conclusion_stream(
+# `<<<CARD 3>>>` の名前部分からカード番号を取り出す（`CARD3`, `card 3:` なども許す）
+CARD_KEY_RE = re.compile(r"CARD\s*(\d+)", re.IGNORECASE)
+
+# リーディングの区切りが読み取れなかったときの注意書きを流すキー
+READING_NOTICE_KEY: str = "reading_notice"
+
+
+def batched_reading_stream(
     chat: ChatOpenAI,
     sig: DealtCard,
     query_text: str,
     all_cards: List[DealtCard],
-    pos_labels_en: List[str],
-    recurrences_en: str = "",
-) -> Iterator[str]:
+    pos_labels: List[str],
+) -> Iterator[Tuple[Union[int, str], str]]:
     """
-    スプレッド全体を要約（まとめ）する LLM ストリーム。
-    同ランク複数出現があれば、その情報も付加する。
+    all_cards に渡した数枚分のリーディングを 1 回の LLM ストリームでまとめて生成し、
+    (カードの index, 断片) の列として返す。
+    各カードの出力は `<<<CARD index>>>` の行で区切るよう指示し、受信側で分割する。
+    区切りが 1 つも読み取れなければ、最後に (READING_NOTICE_KEY, 注意書き) を返す。
     """
-    sig_en = sig.get("name", "")
-    summary = f"significator = {sig_en}\nquery_text = {query_text}\n\n[スプレッド概要 / Spread]\n"
+    parts: List[str] = [build_query_header(sig, query_text)]
     for c in all_cards:
         idx = c.get("index", 0)
-        jp = c.get("japanese_name", "")
-        en = c.get("name", "")
-        label = pos_labels_en[idx] if idx < len(pos_labels_en) else f"{idx}th"
-        orient_str = ORIENT_LABEL.get(c.get("orientation", "upright"), "upright") if idx != 0 else "N/A (Significator)"
-        summary += f"・{label}: {jp}（{en}） / {orient_str}\n"
-
-    if recurrences_en.strip():
-        summary += "\n[Recurrences]\n" + recurrences_en + "\n"
-
-    summary += "\n上記を踏まえ、 わかりやすい日本語で、簡潔な短いまとめを提示してください。回答に表題は不要です。"
-    return stream_chat(chat, [SystemMessage(content=SYSTEM_PROMPT), HumanMessage(content=summary)])
+        pos_label = pos_labels[idx] if idx < len(pos_labels) else f"{idx}枚目"
+        parts.append(f"[カード {idx} の情報]\n" + card_info_block(c, pos_label) + "\n")
+    parts.append(
+        "上記の各カードについて、カードの意味と位置を踏まえ、質問内容に対するリーディングを簡潔に短く解説してください。\n"
+        "改行を適宜入れ、読みやすい文章にしてください。各リーディングに表題は不要です。\n"
+        "各カードのリーディングの直前に、そのカードの番号を <<<CARD 番号>>> の形で 1 行で書いてください"
+        "（例: <<<CARD 0>>>）。\n"
+        f"カードの番号順に、全 {len(all_cards)} 枚分を出力してください。前置きや結びの文章は不要です。\n"
+        "回答はすべて日本語でお願いします。\n"
+    )
+    prompt = "".join(parts)
+    pieces = stream_chat(
+        chat.bind(**max_tokens_kwargs(READING_MAX_TOKENS_PER_CARD * len(all_cards))),
+        [SYSTEM_MESSAGE, HumanMessage(content=prompt)],
+    )
+    # 区切り記号が崩れていても、知らない名前でも、本文は捨てずに直前（最初は先頭）のカードへ振り分ける
+    indices = {c.get("index", 0) for c in all_cards}
+    current = all_cards[0].get("index", 0) if all_cards else 0
+    marked = False
+    for key, piece in split_sections(pieces, first_key=""):
+        m = CARD_KEY_RE.search(key)
+        if m and int(m.group(1)) in indices:
+            current = int(m.group(1))
+            marked = True
+        yield current, piece
+    if not marked and all_cards:
+        first = pos_labels[current] if current < len(pos_labels) else f"{current}枚目"
+        yield READING_NOTICE_KEY, (
+            f"LLM の出力にカードの区切りが無かったため、{first}から {len(all_cards)} 枚分の"
+            f"リーディングを「{first}」の欄にまとめて表示しています。\n"
+        )
 
 
-def advice_stream(
-    chat: ChatOpenAI,
+def build_spread_summary(
     sig: DealtCard,
     query_text: str,
     all_cards: List[DealtCard],
-    conclusion_text: str,
     pos_labels_en: List[str],
     recurrences_en: str = "",
-) -> Iterator[str]:
+) -> str:
     """
-    まとめ（conclusion_text）も踏まえた実践的アドバイスを LLM ストリームで生成する。
+    まとめ／アドバイス用プロンプトの前半となる、スプレッド概要のテキスト。
     同ランク複数出現があれば、その情報も付加する。
     """
-    sig_en = sig.get("name", "")
-    summary = f"significator = {sig_en}\nquery_text = {query_text}\n\n[スプレッド概要 / Spread]\n"
+    lines: List[str] = [build_query_header(sig, query_text), "[スプレッド概要 / Spread]\n"]
     for c in all_cards:
         idx = c.get("index", 0)
         jp = c.get("japanese_name", "")
         en = c.get("name", "")
         label = pos_labels_en[idx] if idx < len(pos_labels_en) else f"{idx}th"
         orient_str = ORIENT_LABEL.get(c.get("orientation", "upright"), "upright") if idx != 0 else "N/A (Significator)"
-        summary += f"・{label}: {jp}（{en}） / {orient_str}\n"
+        lines.append(f"・{label}: {jp}（{en}） / {orient_str}\n")
 
     if recurrences_en.strip():
-        summary += "\n[Recurrences]\n" + recurrences_en + "\n"
+        lines.append("\n[Recurrences]\n" + recurrences_en + "\n")
+    return "".join(lines)
+
+
+# まとめ／アドバイスの区切り記号の名前として受け付けるもの（`<<<まとめ>>>` なども許す）
+SUMMARY_KEY_RE = re.compile(r"SUMMARY|CONCLUSION|まとめ|結論", re.IGNORECASE)
+ADVICE_KEY_RE = re.compile(r"ADVICE|アドバイス|助言", re.IGNORECASE)
 
-    summary += (
-        "\n上記の流れと次のまとめをふまえて、実践的でやさしい日本語のアドバイスを簡潔に短く提示してください。回答に表題は不要です。\n"
-        "[まとめ / Summary]\n" + conclusion_text
-    )
 
-    return stream_chat(chat, [SystemMessage(content=SYSTEM_PROMPT), HumanMessage(content=summary)])
+def conclusion_advice_stream(chat: ChatOpenAI, spread_summary: str) -> Iterator[Tuple[str, str]]:
+    """
+    スプレッド全体のまとめと、それを踏まえた実践的アドバイスを 1 回の LLM ストリームで生成し、
+    ("SUMMARY" | "ADVICE", 断片) の列として返す。
+    区切り記号が無い・読み取れない部分は捨てずに、直前（最初は "SUMMARY"）のセクションへ入れる。
+    """
+    prompt = spread_summary + (
+        "\n上記を踏まえ、次の 2 つを順に提示してください。回答に表題は不要です。\n"
+        "1. わかりやすい日本語での、簡潔な短いまとめ\n"
+        "2. 上記の流れとそのまとめをふまえた、実践的でやさしい日本語のアドバイス（簡潔に短く）\n"
+        "まとめの直前に <<<SUMMARY>>>、アドバイスの直前に <<<ADVICE>>> を、それぞれ 1 行で書いてください。\n"
+    )
+    pieces = stream_chat(
+        chat.bind(**max_tokens_kwargs(CONCLUSION_MAX_TOKENS)),
+        [SYSTEM_MESSAGE, HumanMessage(content=prompt)],
+    )
+    current = "SUMMARY"
+    for key, piece in split_sections(pieces, first_key=""):
+        if ADVICE_KEY_RE.search(key):
+            current = "ADVICE"
+        elif SUMMARY_KEY_RE.search(key):
+            current = "SUMMARY"
+        yield current, piece
 
 
 # ========================= メイン処理 =========================
@@ -799,21 +1203,23 @@ if submitted:
     conclusion_text: str = ""
     advice_text: str = ""
 
-    # 日本語→英語（TF-IDFで類似度を計算するため）
-    translated_query: str = translate_query(query_text, chat)
+    # 日本語→英語（TF-IDFで類似度を計算するため）。結果は象徴カードの選定直前まで待たない
+    translation_future = get_translate_executor().submit(translate_query, query_text, build_translate_llm())
 
     # 象徴カードの候補取得
-    candidates: List[Card] = get_candidate_cards(is_self, sex, over_40)
-    if not candidates:
+    bucket: Optional[CandidateBucket] = CANDIDATE_BUCKETS.get((is_self, sex, over_40))
+    if bucket is None:
         st.error("カードデータが読み込めていません。JSON データを確認ください。")
         st.stop()
 
     # シグニフィケーター選定
-    sig_card: Card = choose_card(candidates, translated_query)
+    translated_query: str = translation_future.result()
+    rng = get_rng()
+    sig_card: Card = choose_card(bucket, translated_query, rng)
     sig_img_id: str = sig_card.get("img_id", "00")
 
     # 10枚引く
-    spread: List[Dict[str, Union[Card, str, int]]] = generate_spread(sig_img_id)
+    spread: List[Dict[str, Union[Card, str, int]]] = generate_spread(sig_img_id, rng)
 
     # 位置ラベル
     pos_labels_en: List[str] = [
@@ -864,21 +1270,19 @@ if submitted:
         for c in all_cards
     ]
 
-    # 画像を base64 化
-    b64_images: List[str] = [img_to_base64(f"cards/{c['img_id']}.png") for c in all_cards]
+    # 画像の URL
+    img_urls: List[str] = [CARD_IMG_URL.get(c["img_id"], TRANSPARENT_PNG_URI) for c in all_cards]
 
     # 視線の向きを反映
     layout: str = str(all_cards[0].get("looking", "unclear"))
-    layout = layout if layout in ["right", "left"] else random.choice(["right", "left"])
+    layout = layout if layout in ["right", "left"] else rng.choice(["right", "left"])
     render_layout_css(layout)
 
     # スプレッドを描画
-    board_html: str = "".join(
-        '<div class="card-position card-pos{idx}"><img src="data:image/png;base64,{img}" alt="card{idx}" style="transform:{rot};" /></div>'.format(  # noqa: E501
-            idx=i, img=b64_images[i], rot=rotations[i]
-        )
-        for i in range(len(b64_images))
-    )
+    board_html: str = "".join([
+        BOARD_CARD_TMPL % (i, img, i, rot)
+        for i, (img, rot) in enumerate(zip(img_urls, rotations))
+    ])
     st.markdown(f'<div class="celtic-cross-container">{board_html}</div>', unsafe_allow_html=True)
 
     def card_line(c: DealtCard) -> str:
@@ -899,32 +1303,40 @@ if submitted:
 
     st.divider()
     st.header("各カードのリーディング")
+    reading_notice = st.empty()
+    reading_placeholders: Dict[Any, Any] = {}
     for c in all_cards:
         idx = c.get("index", 0)
         pos_label = pos_labels_ja[idx] if idx < len(pos_labels_ja) else f"{idx}枚目"
         angle = "rotate(0deg)" if idx == 0 else (
             "rotate(180deg)" if c.get("orientation", "upright") == "reversed" else "rotate(0deg)"
         )
-        img_b64 = img_to_base64(f"cards/{c.get('img_id','00')}.png")
+        img_url = img_urls[idx]
         jp = c.get("japanese_name", "")
         en = c.get("name", "")
         sub_title = (
             f"{pos_label}: {jp}（{en}）" if idx == 0
             else f"{pos_label}: {jp}（{en}） / {ORIENT_LABEL.get(c.get('orientation','upright'),'upright')}"
         )
-        st.subheader(sub_title)
+        # 見出しと画像は 1 つの要素にまとめて描画する
         st.markdown(
-            f'''
-            <img src="data:image/png;base64,{img_b64}" alt="{en}"
-                 style="width:240px; height:auto; transform:{angle};
-                        filter: drop-shadow(0 0 3px darkgray);" />
-            ''',
+            f"### {sub_title}\n\n"
+            f'<img src="{img_url}" alt="{en}" '
+            f'style="width:240px; height:auto; transform:{angle}; filter: drop-shadow(0 0 3px darkgray);" />',
             unsafe_allow_html=True,
         )
-        reading_body = write_stream(reading_stream(chat, all_cards[0], query_text, c, pos_label))
-        card_readings.append({"index": str(idx), "title": sub_title, "body": reading_body})
+        reading_placeholders[idx] = st.empty()
+        card_readings.append({"index": str(idx), "title": sub_title, "body": ""})
         st.divider()
 
+    # リーディングは READING_BATCH_SIZE 枚ずつまとめて受け取り、各プレースホルダへ振り分ける
+    streams: List[Iterable[Tuple[Any, str]]] = [
+        batched_reading_stream(chat, all_cards[0], query_text, all_cards[i:i + READING_BATCH_SIZE], pos_labels_ja)
+        for i in range(0, len(all_cards), READING_BATCH_SIZE)
+    ]
+    placeholders: Dict[Any, Any] = dict(reading_placeholders)
+    placeholders[READING_NOTICE_KEY] = reading_notice
+
     # ---------- 同ランク複数出現のセクション（あれば） ----------
 
     if recurrences_en.strip():
@@ -932,23 +1344,35 @@ if submitted:
         summary_ja = build_recurrence_summary_ja(counts)
         st.subheader("出現したもの")
         st.markdown(summary_ja)
-        _ = write_stream(recurrence_reading_stream(chat, query_text, recurrences_en, summary_ja))
+        placeholders["recurrence"] = st.empty()
+        streams.append(
+            tag_stream("recurrence", recurrence_reading_stream(chat, all_cards[0], query_text, recurrences_en, summary_ja))
+        )
         st.divider()
 
     # ---------- まとめ ----------
 
     st.header("まとめ")
-    conclusion_text = write_stream(
-        conclusion_stream(chat, all_cards[0], query_text, all_cards, pos_labels_en, recurrences_en)
-    )
+    placeholders["SUMMARY"] = st.empty()
 
     # ---------- アドバイス ----------
 
     st.divider()
     st.header("アドバイス")
-    advice_text = write_stream(
-        advice_stream(chat, all_cards[0], query_text, all_cards, conclusion_text, pos_labels_en, recurrences_en)
-    )
+    placeholders["ADVICE"] = st.empty()
+
+    # まとめとアドバイスは 1 回の呼び出しで受け取り、区切り記号で振り分ける
+    spread_summary = build_spread_summary(all_cards[0], query_text, all_cards, pos_labels_en, recurrences_en)
+    streams.append(conclusion_advice_stream(chat, spread_summary))
+
+    # リーディング・同ランク複数出現・まとめとアドバイスは互いに独立なので、同時に生成する
+    texts = write_sections(merge_streams(streams), placeholders)
+    if texts.get(READING_NOTICE_KEY):
+        reading_notice.warning(texts[READING_NOTICE_KEY])
+    for r in card_readings:
+        r["body"] = texts.get(int(r["index"]), "")
+    conclusion_text = texts.get("SUMMARY", "")
+    advice_text = texts.get("ADVICE", "")
 
     # ---------- リセット ----------
 